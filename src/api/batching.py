@@ -0,0 +1,106 @@
+"""
+Dynamic micro-batching for concurrent prediction requests.
+
+Requests are queued and a single consumer task groups whatever arrives within
+a short window (or until a batch is full) into one vectorized scoring call,
+then hands each caller its own result.
+"""
+
+import asyncio
+from typing import Callable, List, Optional, Sequence, Tuple
+
+
+class MicroBatcher:
+    """
+    Collect concurrent requests into batches for one vectorized model call.
+
+    `score_fn` receives a list of records and must return a pair of sequences
+    (probabilities, predictions) aligned with it. It runs in the default thread
+    pool so the event loop keeps accepting requests while a batch is scored.
+    """
+
+    def __init__(
+        self,
+        score_fn: Callable[[List[dict]], Tuple[Sequence, Sequence]],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 2.0,
+        max_queue: int = 1024
+    ):
+        """
+        Args:
+            score_fn: Batch scoring function (see class docstring).
+            max_batch_size: Maximum number of requests scored together.
+            max_wait_ms: How long the first request of a batch waits for more.
+            max_queue: Maximum number of queued requests; `submit` raises
+                asyncio.QueueFull beyond it.
+        """
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_queue = max_queue
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def submit(self, record: dict):
+        """Queue one record and wait for its (probability, prediction)."""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((record, future))
+        return await future
+
+    async def _collect(self) -> list:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            # Take everything already waiting before sleeping on the queue
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            # Callers that gave up (e.g. client disconnect) are not scored
+            batch = [(record, future) for record, future in batch if not future.done()]
+            if not batch:
+                continue
+            try:
+                probabilities, predictions = await loop.run_in_executor(
+                    None, self.score_fn, [record for record, _ in batch]
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), probability, prediction in zip(batch, probabilities, predictions):
+                if not future.done():
+                    future.set_result((probability, prediction))
@@ -0,0 +1,102 @@
+"""
+Immutable model bundles for the serving path.
+
+A bundle pairs a fitted model with its compiled feature encoder and a content
+version. The API swaps whole bundles with a single reference assignment, so a
+request always sees a model and an encoder that belong together.
+"""
+
+import hashlib
+import pickle
+import time
+from dataclasses import dataclass, replace
+from typing import Any
+
+import numpy as np
+
+from src.api.encoder import FeatureEncoder, NUMERIC_FIELDS, BINARY_MAPS, CATEGORY_VOCAB
+
+# Synthetic rows pushed through the full preprocess-and-predict path before a swap
+WARMUP_ROWS = 64
+
+
+@dataclass(frozen=True)
+class ModelBundle:
+    model: Any
+    encoder: FeatureEncoder
+    version: str
+    champion: str
+    path: str
+    load_seconds: float
+    loaded_at: float
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Churn probability (positive class) for an encoded feature matrix."""
+        return self.model.predict_proba(X)[:, 1]
+
+
+def file_version(path: str, champion: str) -> str:
+    """Version string derived from the artifact content, e.g. 'XGBoost@1a2b3c4d5e6f'."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return f"{champion}@{digest.hexdigest()[:12]}"
+
+
+def synthetic_records(n_rows: int) -> list:
+    """Valid customer records cycling through every category value."""
+    records = []
+    for i in range(n_rows):
+        record = {field: float(i % 72) for field in NUMERIC_FIELDS}
+        record['SeniorCitizen'] = i % 2
+        for field, mapping in BINARY_MAPS.items():
+            values = list(mapping)
+            record[field] = values[i % len(values)]
+        for field, values in CATEGORY_VOCAB.items():
+            record[field] = values[i % len(values)]
+        records.append(record)
+    return records
+
+
+def warm_up(bundle: ModelBundle, n_rows: int = WARMUP_ROWS):
+    """Run synthetic rows through both encoder paths and the model, checking the output."""
+    records = synthetic_records(n_rows)
+    for block in (records[:1], records):
+        X = bundle.encoder.transform(block)
+        probabilities = bundle.predict_proba(X)
+        if probabilities.shape != (len(block),) or not np.all(np.isfinite(probabilities)):
+            raise ValueError(f"Model {bundle.version} returned invalid probabilities during warm-up")
+
+
+def build_bundle(model, version: str, champion: str = "", path: str = "",
+                 load_started: float = None) -> ModelBundle:
+    """Validate a fitted model, compile its encoder and warm it up."""
+    if load_started is None:
+        load_started = time.perf_counter()
+    if not hasattr(model, "predict_proba"):
+        raise ValueError("Model does not implement predict_proba")
+
+    encoder = FeatureEncoder.from_model(model)
+    bundle = ModelBundle(
+        model=model,
+        encoder=encoder,
+        version=version,
+        champion=champion,
+        path=path,
+        load_seconds=0.0,
+        loaded_at=time.time(),
+    )
+    warm_up(bundle)
+
+    # Record the full load time, including validation and warm-up
+    return replace(bundle, load_seconds=time.perf_counter() - load_started)
+
+
+def load_bundle(path: str, champion: str) -> ModelBundle:
+    """Unpickle a model artifact and turn it into a ready-to-serve bundle."""
+    started = time.perf_counter()
+    version = file_version(path, champion)
+    with open(path, "rb") as f:
+        model = pickle.load(f)
+    return build_bundle(model, version, champion=champion, path=path, load_started=started)
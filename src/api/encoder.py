@@ -0,0 +1,224 @@
+"""
+Precompiled feature encoder for the serving path.
+
+The encoder is compiled once from a fitted model (its `feature_names_in_` and,
+for XGBoost models trained with `enable_categorical`, its category vocabularies)
+and then turns customer records straight into a float32 NumPy matrix through
+precomputed column-index lookups. It reproduces `src/feature_engineering.py`
+for both the `one_hot` and `no_encoding` strategies without touching pandas.
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+
+# Raw input fields, in CustomerData order
+NUMERIC_FIELDS = ['SeniorCitizen', 'Tenure', 'MonthlyCharges', 'TotalCharges']
+
+# Binary fields and the integer values feature_engineering maps them to
+BINARY_MAPS = {
+    'Gender': {'Male': 0, 'Female': 1},
+    'Partner': {'No': 0, 'Yes': 1},
+    'Dependents': {'No': 0, 'Yes': 1},
+    'PhoneService': {'No': 0, 'Yes': 1},
+    'PaperlessBilling': {'No': 0, 'Yes': 1},
+}
+
+# Training vocabulary of the categorical fields, sorted like pandas' category dtype
+_SERVICE = ['No', 'No internet service', 'Yes']
+CATEGORY_VOCAB = {
+    'MultipleLines': ['No', 'No phone service', 'Yes'],
+    'InternetService': ['DSL', 'Fiber optic', 'No'],
+    'OnlineSecurity': _SERVICE,
+    'OnlineBackup': _SERVICE,
+    'DeviceProtection': _SERVICE,
+    'TechSupport': _SERVICE,
+    'StreamingTV': _SERVICE,
+    'StreamingMovies': _SERVICE,
+    'Contract': ['Month-to-month', 'One year', 'Two year'],
+    'PaymentMethod': [
+        'Bank transfer (automatic)', 'Credit card (automatic)',
+        'Electronic check', 'Mailed check'
+    ],
+}
+
+CATEGORICAL_FIELDS = list(CATEGORY_VOCAB)
+
+# Blocks up to this size are encoded row by row, larger ones column by column
+ROW_PATH_MAX_ROWS = 16
+
+
+def get_model_categories(model) -> Dict[str, List[str]]:
+    """Return the category vocabularies stored in an XGBoost model, if any.
+
+    XGBoost >= 3.1 keeps the categories seen during training inside the booster.
+    Older versions (and non-XGBoost models) return an empty dict.
+    """
+    try:
+        booster = model.get_booster()
+        categories = booster.get_categories(export_to_arrow=True).to_arrow()
+    except Exception:
+        return {}
+    return {
+        name: values.to_pylist()
+        for name, values in categories
+        if values is not None
+    }
+
+
+class FeatureEncoder:
+    """
+    Compiled mapping from raw customer fields to model feature columns.
+
+    Every categorical or binary field is first turned into an integer code
+    (its index in the field's vocabulary, -1 when unknown) and then written
+    into the output matrix through lookup tables built at compile time.
+    """
+
+    def __init__(
+        self,
+        feature_names: Sequence[str],
+        native_categories: Optional[Dict[str, List[str]]] = None
+    ):
+        """
+        Compile the encoder.
+
+        Args:
+            feature_names: Columns the model was trained on, in order.
+            native_categories: Vocabulary of each field the model consumes as a
+                native categorical (XGBoost `enable_categorical`), in category
+                code order. Fields absent here are one-hot encoded.
+        """
+        self.feature_names = [str(f) for f in feature_names]
+        self.n_features = len(self.feature_names)
+        native_categories = native_categories or {}
+        index = {name: i for i, name in enumerate(self.feature_names)}
+
+        # field -> output column for directly copied numeric fields
+        self.numeric_columns = {f: index[f] for f in NUMERIC_FIELDS if f in index}
+
+        # field -> value -> code, shared by every path that decodes raw strings
+        self.vocab: Dict[str, List[str]] = {}
+        self.codes: Dict[str, Dict[str, int]] = {}
+
+        # field -> (output column, float value per code); last entry is for unknown codes
+        self.value_columns: Dict[str, tuple] = {}
+        # field -> output column per code (-1 = no column, e.g. the dropped baseline)
+        self.onehot_columns: Dict[str, np.ndarray] = {}
+
+        for field, mapping in BINARY_MAPS.items():
+            vocab = list(mapping)
+            self._add_vocab(field, vocab)
+            if field in index:
+                values = [mapping[v] for v in vocab] + [np.nan]
+                self.value_columns[field] = (index[field], np.array(values, dtype=np.float32))
+
+        for field in CATEGORICAL_FIELDS:
+            if field in native_categories or field in index:
+                # Native categorical: the value is the category code of the training data
+                vocab = list(native_categories.get(field, CATEGORY_VOCAB[field]))
+                self._add_vocab(field, vocab)
+                if field in index:
+                    values = list(range(len(vocab))) + [np.nan]
+                    self.value_columns[field] = (index[field], np.array(values, dtype=np.float32))
+                continue
+
+            # One-hot: columns are named "<field>_<value>" by pd.get_dummies
+            prefix = f"{field}_"
+            vocab = list(CATEGORY_VOCAB[field])
+            vocab += [f[len(prefix):] for f in self.feature_names
+                      if f.startswith(prefix) and f[len(prefix):] not in vocab]
+            self._add_vocab(field, vocab)
+            columns = [index.get(prefix + v, -1) for v in vocab] + [-1]
+            self.onehot_columns[field] = np.array(columns, dtype=np.intp)
+
+        # Plain-Python copies of the tables for the per-row path used on small blocks,
+        # where NumPy call overhead would dominate
+        self._row_plan = (
+            list(self.numeric_columns.items()),
+            [(f, self.codes[f], col, values.tolist()) for f, (col, values) in self.value_columns.items()],
+            [(f, self.codes[f], table.tolist()) for f, table in self.onehot_columns.items()],
+        )
+
+    @classmethod
+    def from_model(cls, model) -> "FeatureEncoder":
+        """Compile an encoder for a fitted sklearn/XGBoost model."""
+        if not hasattr(model, "feature_names_in_"):
+            raise ValueError("Model does not have feature_names_in_")
+        feature_names = list(model.feature_names_in_)
+
+        native = {}
+        feature_types = None
+        try:
+            feature_types = model.get_booster().feature_types
+        except Exception:
+            pass
+        if feature_types:
+            stored = get_model_categories(model)
+            for name, ftype in zip(feature_names, feature_types):
+                if ftype == 'c' and name in CATEGORY_VOCAB:
+                    native[name] = stored.get(name, CATEGORY_VOCAB[name])
+
+        return cls(feature_names, native_categories=native)
+
+    def _add_vocab(self, field: str, vocab: List[str]):
+        self.vocab[field] = vocab
+        self.codes[field] = {v: i for i, v in enumerate(vocab)}
+
+    def encode_codes(self, field: str, values: Sequence[str]) -> np.ndarray:
+        """Map raw category strings of one field to integer codes (-1 = unknown)."""
+        lookup = self.codes[field]
+        return np.fromiter((lookup.get(v, -1) for v in values), dtype=np.int16, count=len(values))
+
+    def transform_columns(self, columns: Dict[str, np.ndarray], n_rows: int) -> np.ndarray:
+        """
+        Encode column arrays into the model's feature matrix.
+
+        Args:
+            columns: Numeric fields as float arrays and categorical/binary fields
+                as integer code arrays (see `encode_codes`).
+            n_rows: Number of rows.
+        """
+        X = np.zeros((n_rows, self.n_features), dtype=np.float32)
+
+        for field, col in self.numeric_columns.items():
+            X[:, col] = columns[field]
+
+        for field, (col, values) in self.value_columns.items():
+            X[:, col] = values[columns[field]]
+
+        rows = np.arange(n_rows)
+        for field, table in self.onehot_columns.items():
+            cols = table[columns[field]]
+            hit = cols >= 0
+            X[rows[hit], cols[hit]] = 1.0
+
+        return X
+
+    def transform(self, records: Sequence[dict]) -> np.ndarray:
+        """Encode a list of customer dicts into a float32 feature matrix."""
+        n_rows = len(records)
+        if n_rows <= ROW_PATH_MAX_ROWS:
+            return self._transform_rows(records)
+
+        columns = {}
+        for field in self.numeric_columns:
+            columns[field] = np.fromiter((r[field] for r in records), dtype=np.float32, count=n_rows)
+        for field in self.vocab:
+            if field in self.value_columns or field in self.onehot_columns:
+                columns[field] = self.encode_codes(field, [r[field] for r in records])
+        return self.transform_columns(columns, n_rows)
+
+    def _transform_rows(self, records: Sequence[dict]) -> np.ndarray:
+        numeric, value_fields, onehot_fields = self._row_plan
+        X = np.zeros((len(records), self.n_features), dtype=np.float32)
+        for i, r in enumerate(records):
+            row = X[i]
+            for field, col in numeric:
+                row[col] = r[field]
+            for field, lookup, col, values in value_fields:
+                row[col] = values[lookup.get(r[field], -1)]
+            for field, lookup, table in onehot_fields:
+                col = table[lookup.get(r[field], -1)]
+                if col >= 0:
+                    row[col] = 1.0
+        return X
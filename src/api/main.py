@@ -1,11 +1,19 @@
-import pickle
+import asyncio
 import json
-import pandas as pd
+import threading
 import numpy as np
 import os
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from typing import Literal
+import warnings
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, ValidationError
+from typing import Literal, List, Dict, Any
+
+from src.api.batching import MicroBatcher
+from src.api.bundle import ModelBundle, load_bundle
+from src.api.cache import PredictionCache, payload_key
+from src.api.encoder import FeatureEncoder
 
 app = FastAPI(title="Telco Churn Prediction API")
 
@@ -13,11 +21,39 @@ app = FastAPI(title="Telco Churn Prediction API")
 # --- Configuration & Model Loading ---
 MODEL_DIR = "artifacts"
 METADATA_PATH = os.path.join(MODEL_DIR, "champion_metadata.json")
-model = None
 
-def get_champion_path():
-    """Determine the path of the current champion model."""
+# The serving state is one immutable ModelBundle (model + encoder + version).
+# Handlers read `bundle` once per request; reloads replace it in one assignment.
+bundle = None
+_reload_lock = threading.Lock()
+
+# --- Micro-batching (opt-in) ---
+# When enabled, concurrent /predict calls are grouped into one predict_proba call.
+BATCHING_ENABLED = os.getenv("PREDICT_BATCHING", "0").lower() in ("1", "true", "yes")
+BATCH_MAX_SIZE = int(os.getenv("PREDICT_BATCH_MAX_SIZE", "64"))
+BATCH_MAX_WAIT_MS = float(os.getenv("PREDICT_BATCH_MAX_WAIT_MS", "2"))
+BATCH_QUEUE_DEPTH = int(os.getenv("PREDICT_BATCH_QUEUE_DEPTH", "1024"))
+batcher = None
+
+# --- NDJSON streaming ---
+# Number of lines parsed, validated and scored together by /predict/stream
+STREAM_CHUNK_ROWS = int(os.getenv("STREAM_CHUNK_ROWS", "1024"))
+
+# --- Prediction cache ---
+# Keyed by payload hash + model version and cleared on every reload.
+CACHE_MAX_ENTRIES = int(os.getenv("PREDICTION_CACHE_SIZE", "10000"))
+CACHE_MAX_BYTES = int(os.getenv("PREDICTION_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+CACHE_TTL_SECONDS = float(os.getenv("PREDICTION_CACHE_TTL", "0")) or None
+prediction_cache = PredictionCache(CACHE_MAX_ENTRIES, CACHE_MAX_BYTES, CACHE_TTL_SECONDS)
+
+# The encoder feeds plain NumPy arrays; sklearn would warn on every call that
+# they carry no column names even though the column order is guaranteed.
+warnings.filterwarnings("ignore", message="X does not have valid feature names")
+
+def get_champion():
+    """Determine the name and artifact file of the current champion model."""
     # Default to XGBoost if no metadata
+    champion = "XGBoost"
     model_file = "xgboost_model.pkl" 
     
     if os.path.exists(METADATA_PATH):
@@ -35,36 +71,79 @@ def get_champion_path():
         except Exception as e:
             print(f"Error reading metadata, defaulting to XGBoost: {e}")
             
-    return os.path.join(MODEL_DIR, model_file)
+    return champion, os.path.join(MODEL_DIR, model_file)
+
+def get_champion_path():
+    """Determine the path of the current champion model."""
+    return get_champion()[1]
 
 def _load_model_logic():
-    global model
-    try:
-        path = get_champion_path()
+    """Load, validate and warm up the champion, then swap it in atomically.
+
+    Returns (old_bundle, new_bundle). Raises if the new model cannot be loaded,
+    in which case the previous bundle keeps serving.
+    """
+    global bundle
+    with _reload_lock:
+        champion, path = get_champion()
         if not os.path.exists(path):
             # Fallback for local run vs docker
             base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
             path = os.path.join(base_dir, path)
             
         if not os.path.exists(path):
-             print(f"Error: Model file not found at {path}")
-             return
+            raise FileNotFoundError(f"Model file not found at {path}")
+
+        new_bundle = load_bundle(path, champion)
+        old_bundle = bundle
+        bundle = new_bundle
+        prediction_cache.clear()
+        print(f"Model loaded successfully from {path} "
+              f"(version {new_bundle.version}, {new_bundle.load_seconds:.3f}s)")
+        return old_bundle, new_bundle
 
-        with open(path, "rb") as f:
-            model = pickle.load(f)
-        print(f"Model loaded successfully from {path}")
+@app.on_event("startup")
+async def load_model():
+    global batcher
+    try:
+        await run_in_threadpool(_load_model_logic)
     except Exception as e:
         print(f"Error loading model: {e}")
+    if BATCHING_ENABLED:
+        batcher = MicroBatcher(
+            score_records,
+            max_batch_size=BATCH_MAX_SIZE,
+            max_wait_ms=BATCH_MAX_WAIT_MS,
+            max_queue=BATCH_QUEUE_DEPTH
+        )
+        await batcher.start()
+        print(f"Micro-batching enabled (max_batch_size={BATCH_MAX_SIZE}, max_wait_ms={BATCH_MAX_WAIT_MS})")
 
-@app.on_event("startup")
-def load_model():
-    _load_model_logic()
+@app.on_event("shutdown")
+async def stop_batcher():
+    global batcher
+    if batcher is not None:
+        await batcher.stop()
+        batcher = None
 
 @app.post("/reload")
-def reload_model():
-    """Endpoint to trigger model reloading."""
-    _load_model_logic()
-    return {"status": "Model reloaded", "champion_path": get_champion_path()}
+async def reload_model():
+    """Endpoint to trigger model reloading.
+
+    The new champion is loaded, validated and warmed up on a worker thread while
+    the current model keeps serving, and is only swapped in once it is ready.
+    """
+    try:
+        old_bundle, new_bundle = await run_in_threadpool(_load_model_logic)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Reload failed, previous model still serving: {e}")
+    return {
+        "status": "Model reloaded",
+        "champion_path": new_bundle.path,
+        "old_version": old_bundle.version if old_bundle else None,
+        "new_version": new_bundle.version,
+        "load_seconds": round(new_bundle.load_seconds, 4)
+    }
 
         
 # --- Data Schema ---
@@ -93,88 +172,202 @@ class CustomerData(BaseModel):
     PaymentMethod: str
 
 # --- Preprocessing ---
-def preprocess_input(data: CustomerData, model_features: list) -> pd.DataFrame:
-    # Convert Pydantic model to dict
-    input_dict = data.dict()
-    
-    # Rename keys if necessary to match model features (none needed based on inspection)
-    # The model expects "Gender", "SeniorCitizen", "Partner", ...
-    
-    df = pd.DataFrame([input_dict])
-    
-    # --- FEATURE ENGINEERING (Must match src/feature_engineering.py) ---
-    
-    # 1. Binary Encoding
-    binary_cols = ['Partner', 'Dependents', 'PhoneService', 'PaperlessBilling']
-    for col in binary_cols:
-        if col in df.columns:
-            df[col] = df[col].map({'Yes': 1, 'No': 0})
-        
-    # 2. Gender Encoding
-    if 'Gender' in df.columns:
-        df['Gender'] = df['Gender'].map({'Female': 1, 'Male': 0})
-    
-    # 3. Handle Categorical Columns (One-Hot Logic to match training default)
-    # We must replicate the 'one_hot' strategy by default as typical models (LogReg, basic XGB) use it unless strictly separated.
-    # If the loaded model expects raw categories (XGB special), the 'model_features' check below handles appropriate selection,
-    # BUT if 'model_features' has OHE cols, we MUST generate them.
-    
-    # Check if we need to OHE?
-    # Simple heuristic: If model_features contains "Contract_Two year", we need to OHE.
-    needs_ohe = any('_' in feat for feat in model_features if feat not in df.columns)
-    
-    if needs_ohe:
-        cat_cols = [
-            'MultipleLines', 'InternetService', 'OnlineSecurity', 'OnlineBackup', 
-            'DeviceProtection', 'TechSupport', 'StreamingTV', 'StreamingMovies', 
-            'Contract', 'PaymentMethod'
-        ]
-        df = pd.get_dummies(df, columns=[c for c in cat_cols if c in df.columns], drop_first=True)
-            
-    # 4. ALIGNMENT (Crucial for Single-Row Prediction)
-    # Ensure all model features exist, fill missing with 0
-    for feature in model_features:
-        if feature not in df.columns:
-            df[feature] = 0
-            
-    # Remove extra columns that model doesn't know
-    df = df[model_features]
-    
-    return df
+# Encoding logic must match src/feature_engineering.py; it is compiled per model
+# in src/api/encoder.py (binary maps, one-hot columns or native category codes).
+def preprocess_batch(records: list, feature_encoder: FeatureEncoder) -> np.ndarray:
+    """Encode a list of customer dicts into the model's float32 feature matrix."""
+    return feature_encoder.transform(records)
+
+def preprocess_input(data: CustomerData, feature_encoder: FeatureEncoder) -> np.ndarray:
+    """Encode a single customer into a one-row feature matrix."""
+    return feature_encoder.transform([data.dict()])
+
+def get_bundle() -> ModelBundle:
+    """Return the bundle currently serving, or answer 503 if none is loaded."""
+    current = bundle
+    if current is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    return current
+
+def score(X: np.ndarray, current: ModelBundle):
+    """Score a preprocessed matrix with a single predict_proba call.
+
+    Labels are derived from the probabilities (threshold 0.5), which is what
+    both XGBClassifier.predict and LogisticRegression.predict do internally.
+    """
+    probabilities = current.predict_proba(X)
+    predictions = (probabilities > 0.5).astype(int)
+    return probabilities, predictions
+
+def score_records(records: list):
+    """Preprocess and score a list of customer dicts (used by the micro-batcher)."""
+    current = bundle
+    return score(preprocess_batch(records, current.encoder), current)
+
+def format_prediction(prediction, probability) -> dict:
+    result = "Churn" if prediction == 1 else "Not Churn"
+    return {
+        "prediction": result,
+        "probability": float(probability),
+        "churn_value": int(prediction)
+    }
 
 @app.get("/")
 def read_root():
     return {"message": "Welcome to the Churn Prediction API"}
 
-@app.post("/predict")
-def predict_churn(data: CustomerData):
-    global model
-    if model is None:
-        raise HTTPException(status_code=503, detail="Model not loaded")
-    
+def _predict_single(data: CustomerData, current: ModelBundle):
     try:
-        # Get feature names from model
-        if hasattr(model, "feature_names_in_"):
-            feature_names = model.feature_names_in_
-        else:
-            # Fallback based on known list if attribute missing (older sklearn/xgboost?)
-            # But we saw it has it in our inspection.
-             raise HTTPException(status_code=500, detail="Model does not have feature_names_in_")
-
         # Preprocess
-        X = preprocess_input(data, feature_names)
+        X = preprocess_input(data, current.encoder)
         
         # Predict
-        prediction = model.predict(X)[0]
-        probability = model.predict_proba(X)[0][1]
+        probabilities, predictions = score(X, current)
         
-        result = "Churn" if prediction == 1 else "Not Churn"
-        
-        return {
-            "prediction": result,
-            "probability": float(probability),
-            "churn_value": int(prediction)
-        }
+        return float(probabilities[0]), int(predictions[0])
         
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/predict")
+async def predict_churn(data: CustomerData):
+    current = get_bundle()
+
+    key = None
+    if prediction_cache.enabled:
+        key = payload_key(data.dict(), current.version)
+        cached = prediction_cache.get(key)
+        if cached is not None:
+            return format_prediction(cached[1], cached[0])
+
+    if batcher is None:
+        probability, prediction = await run_in_threadpool(_predict_single, data, current)
+    else:
+        try:
+            probability, prediction = await batcher.submit(data.dict())
+        except asyncio.QueueFull:
+            raise HTTPException(status_code=503, detail="Prediction queue is full")
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    if key is not None:
+        prediction_cache.put(key, (float(probability), int(prediction)))
+    return format_prediction(prediction, probability)
+
+@app.get("/cache/stats")
+def cache_stats():
+    """Hit/miss/eviction counters of the prediction cache."""
+    return prediction_cache.stats()
+
+@app.post("/predict/batch")
+def predict_churn_batch(records: List[Dict[str, Any]]):
+    """Score a list of customer records with one vectorized model call.
+
+    Results are returned in input order. Records that fail validation get an
+    "error" entry instead of a prediction and do not fail the rest of the batch.
+    """
+    current = get_bundle()
+
+    results: List[Dict[str, Any]] = [None] * len(records)
+    n_errors = 0
+    # Rows not found in the cache, scored together below
+    valid_rows = []
+    valid_index = []
+    valid_keys = []
+    for i, record in enumerate(records):
+        try:
+            row = CustomerData(**record).dict()
+        except ValidationError as e:
+            results[i] = {"index": i, "error": e.errors(include_url=False, include_context=False)}
+            n_errors += 1
+            continue
+        except TypeError as e:
+            results[i] = {"index": i, "error": str(e)}
+            n_errors += 1
+            continue
+
+        key = None
+        if prediction_cache.enabled:
+            key = payload_key(row, current.version)
+            cached = prediction_cache.get(key)
+            if cached is not None:
+                results[i] = {"index": i, **format_prediction(cached[1], cached[0])}
+                continue
+        valid_rows.append(row)
+        valid_index.append(i)
+        valid_keys.append(key)
+
+    if valid_rows:
+        try:
+            X = preprocess_batch(valid_rows, current.encoder)
+            probabilities, predictions = score(X, current)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        for i, key, prediction, probability in zip(valid_index, valid_keys, predictions, probabilities):
+            results[i] = {"index": i, **format_prediction(prediction, probability)}
+            if key is not None:
+                prediction_cache.put(key, (float(probability), int(prediction)))
+
+    return {
+        "results": results,
+        "count": len(records),
+        "errors": n_errors
+    }
+
+def _score_ndjson_chunk(lines: list, current: ModelBundle) -> bytes:
+    """Parse, validate and score a chunk of (line_number, raw line) pairs.
+
+    Returns the NDJSON output for the chunk, one line per input line, in order.
+    """
+    results = [None] * len(lines)
+    valid_rows = []
+    valid_index = []
+    for i, (line_no, raw) in enumerate(lines):
+        try:
+            valid_rows.append(CustomerData(**json.loads(raw)).dict())
+            valid_index.append(i)
+        except ValidationError as e:
+            results[i] = {"line": line_no, "error": e.errors(include_url=False, include_context=False)}
+        except (ValueError, TypeError) as e:
+            results[i] = {"line": line_no, "error": str(e)}
+
+    if valid_rows:
+        X = preprocess_batch(valid_rows, current.encoder)
+        probabilities, predictions = score(X, current)
+        for i, prediction, probability in zip(valid_index, predictions, probabilities):
+            results[i] = {"line": lines[i][0], **format_prediction(prediction, probability)}
+
+    return "".join(json.dumps(r) + "\n" for r in results).encode("utf-8")
+
+@app.post("/predict/stream")
+async def predict_churn_stream(request: Request):
+    """Score an NDJSON request body incrementally and stream NDJSON results back.
+
+    The body is read as a stream and cut into chunks of STREAM_CHUNK_ROWS lines;
+    each chunk is scored with one model call and written out before the next is
+    read, so memory use does not grow with the size of the upload. Output lines
+    carry the 1-based input line number; invalid lines get an "error" entry.
+    """
+    current = get_bundle()
+
+    async def generate():
+        pending = b""
+        chunk = []
+        line_no = 0
+        async for part in request.stream():
+            lines = (pending + part).split(b"\n")
+            pending = lines.pop()
+            for raw in lines:
+                line_no += 1
+                if raw.strip():
+                    chunk.append((line_no, raw))
+                if len(chunk) >= STREAM_CHUNK_ROWS:
+                    yield await run_in_threadpool(_score_ndjson_chunk, chunk, current)
+                    chunk = []
+        if pending.strip():
+            chunk.append((line_no + 1, pending))
+        if chunk:
+            yield await run_in_threadpool(_score_ndjson_chunk, chunk, current)
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
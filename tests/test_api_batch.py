@@ -0,0 +1,144 @@
+from fastapi.testclient import TestClient
+import json
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.api import main
+from src.api.bundle import build_bundle
+from src.api.encoder import FeatureEncoder
+from src.feature_engineering import feature_engineering
+
+
+sample_data = {
+    "SeniorCitizen": 0,
+    "Tenure": 12,
+    "MonthlyCharges": 70.5,
+    "TotalCharges": 840.0,
+    "Gender": "Male",
+    "Partner": "No",
+    "Dependents": "No",
+    "PhoneService": "Yes",
+    "MultipleLines": "No",
+    "InternetService": "Fiber optic",
+    "OnlineSecurity": "No",
+    "OnlineBackup": "No",
+    "DeviceProtection": "No",
+    "TechSupport": "No",
+    "StreamingTV": "No",
+    "StreamingMovies": "No",
+    "Contract": "Month-to-month",
+    "PaperlessBilling": "Yes",
+    "PaymentMethod": "Electronic check"
+}
+
+
+def make_customers(n, seed=0):
+    """Random customer records covering every category of the Telco schema."""
+    rng = np.random.default_rng(seed)
+    services = ["Yes", "No", "No internet service"]
+    return pd.DataFrame({
+        "SeniorCitizen": rng.integers(0, 2, n),
+        "Tenure": rng.integers(0, 72, n),
+        "MonthlyCharges": rng.uniform(18, 120, n).round(2),
+        "TotalCharges": rng.uniform(0, 8000, n).round(2),
+        "Gender": rng.choice(["Male", "Female"], n),
+        "Partner": rng.choice(["Yes", "No"], n),
+        "Dependents": rng.choice(["Yes", "No"], n),
+        "PhoneService": rng.choice(["Yes", "No"], n),
+        "MultipleLines": rng.choice(["Yes", "No", "No phone service"], n),
+        "InternetService": rng.choice(["DSL", "Fiber optic", "No"], n),
+        "OnlineSecurity": rng.choice(services, n),
+        "OnlineBackup": rng.choice(services, n),
+        "DeviceProtection": rng.choice(services, n),
+        "TechSupport": rng.choice(services, n),
+        "StreamingTV": rng.choice(services, n),
+        "StreamingMovies": rng.choice(services, n),
+        "Contract": rng.choice(["Month-to-month", "One year", "Two year"], n),
+        "PaperlessBilling": rng.choice(["Yes", "No"], n),
+        "PaymentMethod": rng.choice([
+            "Electronic check", "Mailed check",
+            "Bank transfer (automatic)", "Credit card (automatic)"
+        ], n),
+        "Churn": rng.choice(["Yes", "No"], n),
+    })
+
+
+@pytest.fixture(scope="module")
+def trained_model():
+    df = feature_engineering(make_customers(500))
+    X = df.drop(columns=["Churn"])
+    model = LogisticRegression(solver="liblinear").fit(X, df["Churn"])
+    return model, X
+
+
+@pytest.fixture
+def client(trained_model, monkeypatch):
+    monkeypatch.setattr(main, "_load_model_logic", lambda: None)
+    monkeypatch.setattr(main, "bundle", build_bundle(trained_model[0], version="test@1"))
+    with TestClient(main.app) as client:
+        yield client
+
+
+def test_preprocess_batch_matches_training_encoding(trained_model):
+    model, X_train = trained_model
+    records = make_customers(50, seed=1).drop(columns=["Churn"]).to_dict("records")
+
+    X = main.preprocess_batch(records, FeatureEncoder.from_model(model))
+    expected = feature_engineering(pd.DataFrame(records)).reindex(columns=X_train.columns, fill_value=0)
+
+    np.testing.assert_allclose(X, expected.to_numpy(dtype=float), rtol=1e-6)
+
+
+def test_predict_batch_matches_single_predictions(client):
+    records = make_customers(20, seed=2).drop(columns=["Churn"]).to_dict("records")
+
+    response = client.post("/predict/batch", json=records)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 20
+    assert body["errors"] == 0
+
+    for i, record in enumerate(records):
+        single = client.post("/predict", json=record).json()
+        result = body["results"][i]
+        assert result["index"] == i
+        assert result["prediction"] == single["prediction"]
+        assert result["probability"] == pytest.approx(single["probability"])
+
+
+def test_predict_batch_reports_row_errors_in_order(client):
+    bad = dict(sample_data, Gender="Unknown")
+    response = client.post("/predict/batch", json=[sample_data, bad, sample_data])
+
+    body = response.json()
+    assert response.status_code == 200
+    assert body["errors"] == 1
+    assert "error" in body["results"][1]
+    assert body["results"][0]["probability"] == body["results"][2]["probability"]
+
+
+def test_predict_stream_scores_ndjson_in_chunks(client, monkeypatch):
+    monkeypatch.setattr(main, "STREAM_CHUNK_ROWS", 4)
+    records = make_customers(10, seed=4).drop(columns=["Churn"]).to_dict("records")
+    lines = [json.dumps(r) for r in records]
+    lines.insert(3, "{not json")
+    lines.insert(6, "")
+    body = "\n".join(lines)
+
+    response = client.post("/predict/stream", content=body.encode("utf-8"))
+    output = [json.loads(line) for line in response.text.splitlines()]
+
+    batch = client.post("/predict/batch", json=records).json()["results"]
+    assert response.status_code == 200
+    assert [o["line"] for o in output] == [1, 2, 3, 4, 5, 6, 8, 9, 10, 11, 12]
+    assert "error" in output[3]
+    scored = [o for o in output if "error" not in o]
+    assert [o["probability"] for o in scored] == pytest.approx([b["probability"] for b in batch])
@@ -0,0 +1,52 @@
+import asyncio
+import sys
+import os
+
+import pytest
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.api.batching import MicroBatcher
+
+
+def test_concurrent_requests_are_scored_together_in_order():
+    batch_sizes = []
+
+    def score_fn(records):
+        batch_sizes.append(len(records))
+        probabilities = [r["x"] / 100 for r in records]
+        return probabilities, [int(p > 0.5) for p in probabilities]
+
+    async def run():
+        batcher = MicroBatcher(score_fn, max_batch_size=8, max_wait_ms=20)
+        await batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.submit({"x": i}) for i in range(20)))
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(run())
+
+    assert results == [(i / 100, 0) for i in range(20)]
+    assert max(batch_sizes) == 8
+    assert sum(batch_sizes) == 20
+
+
+def test_full_queue_rejects_and_errors_reach_every_caller():
+    def score_fn(records):
+        raise ValueError("boom")
+
+    async def run():
+        batcher = MicroBatcher(score_fn, max_batch_size=4, max_wait_ms=1, max_queue=2)
+        await batcher.start()
+        try:
+            tasks = [asyncio.ensure_future(batcher.submit({})) for _ in range(3)]
+            return await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(run())
+
+    assert sum(isinstance(r, asyncio.QueueFull) for r in results) == 1
+    assert sum(isinstance(r, ValueError) for r in results) == 2
@@ -0,0 +1,46 @@
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.api.cache import PredictionCache, payload_key
+
+
+def test_payload_key_is_canonical_and_versioned():
+    a = payload_key({"Tenure": 1, "Gender": "Male"}, "XGBoost@1")
+    b = payload_key({"Gender": "Male", "Tenure": 1}, "XGBoost@1")
+
+    assert a == b
+    assert a != payload_key({"Gender": "Male", "Tenure": 1}, "XGBoost@2")
+
+
+def test_lru_eviction_and_counters():
+    cache = PredictionCache(max_entries=2)
+    cache.put(b"a", (0.1, 0))
+    cache.put(b"b", (0.2, 0))
+    cache.get(b"a")
+    cache.put(b"c", (0.9, 1))
+
+    assert cache.get(b"b") is None
+    assert cache.get(b"a") == (0.1, 0)
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 1, 1)
+
+
+def test_byte_budget_ttl_and_clear(monkeypatch):
+    cache = PredictionCache(max_entries=100, max_bytes=400, ttl_seconds=10)
+    for i in range(10):
+        cache.put(bytes([i]), (0.5, 0))
+    assert cache.nbytes <= 400
+    assert cache.stats()["evictions"] > 0
+
+    now = [1000.0]
+    monkeypatch.setattr("src.api.cache.time.monotonic", lambda: now[0])
+    cache.put(b"k", (0.5, 0))
+    now[0] += 11
+    assert cache.get(b"k") is None
+    assert cache.stats()["expirations"] == 1
+
+    cache.clear()
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,38 @@
+import sys
+import os
+
+import numpy as np
+import xgboost as xgb
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.api.encoder import FeatureEncoder
+from src.feature_engineering import feature_engineering
+from tests.test_api_batch import make_customers
+
+
+def test_native_categorical_model_matches_pandas_input():
+    df = feature_engineering(make_customers(400), config={'encoding': 'no_encoding'})
+    X = df.drop(columns=['Churn'])
+    model = xgb.XGBClassifier(n_estimators=20, max_depth=3, enable_categorical=True).fit(X, df['Churn'])
+
+    customers = make_customers(100, seed=3).drop(columns=['Churn'])
+    expected_input = feature_engineering(customers, config={'encoding': 'no_encoding'})[X.columns]
+    expected = model.predict_proba(expected_input)[:, 1]
+
+    encoder = FeatureEncoder.from_model(model)
+    actual = model.predict_proba(encoder.transform(customers.to_dict('records')))[:, 1]
+
+    assert encoder.onehot_columns == {}
+    np.testing.assert_allclose(actual, expected, rtol=1e-6)
+
+
+def test_unknown_category_encodes_as_all_zero_one_hot():
+    encoder = FeatureEncoder(['Tenure', 'Contract_One year', 'Contract_Two year'])
+    record = make_customers(1).drop(columns=['Churn']).to_dict('records')[0]
+
+    X = encoder.transform([dict(record, Contract='Weekly'), dict(record, Contract='Two year')])
+
+    assert X.dtype == np.float32
+    np.testing.assert_array_equal(X[:, 1:], [[0, 0], [0, 1]])
@@ -0,0 +1,61 @@
+from fastapi.testclient import TestClient
+import json
+import pickle
+import sys
+import os
+
+from sklearn.linear_model import LogisticRegression
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.api import main
+from src.feature_engineering import feature_engineering
+from tests.test_api_batch import make_customers, sample_data
+
+
+def write_models(model_dir):
+    df = feature_engineering(make_customers(300))
+    X, y = df.drop(columns=["Churn"]), df["Churn"]
+    for name, C in [("xgboost_model.pkl", 1.0), ("logistic_regression.pkl", 0.01)]:
+        with open(model_dir / name, "wb") as f:
+            pickle.dump(LogisticRegression(solver="liblinear", C=C).fit(X, y), f)
+
+
+def test_reload_swaps_bundle_and_reports_versions(tmp_path, monkeypatch):
+    write_models(tmp_path)
+    monkeypatch.setattr(main, "MODEL_DIR", str(tmp_path))
+    monkeypatch.setattr(main, "METADATA_PATH", str(tmp_path / "champion_metadata.json"))
+    monkeypatch.setattr(main, "bundle", None)
+
+    with TestClient(main.app) as client:
+        before = client.post("/predict", json=sample_data).json()
+        first_version = main.bundle.version
+
+        (tmp_path / "champion_metadata.json").write_text(json.dumps({"champion": "LogisticRegression"}))
+        response = client.post("/reload")
+        after = client.post("/predict", json=sample_data).json()
+
+    body = response.json()
+    assert response.status_code == 200
+    assert body["old_version"] == first_version
+    assert body["new_version"].startswith("LogisticRegression@")
+    assert body["load_seconds"] > 0
+    assert before["probability"] != after["probability"]
+
+
+def test_failed_reload_keeps_previous_model(tmp_path, monkeypatch):
+    write_models(tmp_path)
+    monkeypatch.setattr(main, "MODEL_DIR", str(tmp_path))
+    monkeypatch.setattr(main, "METADATA_PATH", str(tmp_path / "champion_metadata.json"))
+    monkeypatch.setattr(main, "bundle", None)
+
+    with TestClient(main.app) as client:
+        serving = main.bundle
+        (tmp_path / "xgboost_model.pkl").write_bytes(b"not a pickle")
+        response = client.post("/reload")
+        still_ok = client.post("/predict", json=sample_data)
+
+    assert response.status_code == 500
+    assert main.bundle is serving
+    assert still_ok.status_code == 200